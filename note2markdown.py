@@ -1,11 +1,47 @@
-import xml.etree.ElementTree as ET
 import os
 import json
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Union
 import re
 import html
-from bs4 import BeautifulSoup
+import logging
+import multiprocessing
+from lxml import etree as ET
+import lxml.html
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# 見出しタグとMarkdownの見出しレベルの対応
+HEADING_LEVELS = {f"h{level}": level for level in range(1, 7)}
+
+# 変換後に段落として区切るブロック要素
+BLOCK_TAGS = {'div', 'section', 'article'}
+
+# 本文として出力しない要素（中身はスクリプトやスタイル）
+SKIP_TAGS = {'script', 'style', 'template'}
+
+# 強調系のインライン要素とMarkdownの記号の対応
+EMPHASIS_MARKS = {'strong': '**', 'b': '**', 'em': '*', 'i': '*'}
+
+# 記事本文のパースに使い回すHTMLパーサー（UTF-8のバイト列を直接読む）
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8', huge_tree=True)
+
+# 記事ごとに使う正規表現はあらかじめコンパイルしておく
+_RE_DOCUMENT_CLOSE = re.compile(r'</\s*(?:body|html)\s*>', re.IGNORECASE)
+_RE_BLANKLINES = re.compile(r'\n\s*\n\s*\n+')
+_RE_TRAILING_WS = re.compile(r' +$', re.MULTILINE)
+_RE_SPACES = re.compile(r'\s+')
+_RE_NEEDS_QUOTE = re.compile(r'[:\n"]')
+_RE_BACKTICKS = re.compile(r'`+')
+
+# コードブロックは整形処理の対象外にするため、一旦プレースホルダーに置き換える
+_RE_CODE_PLACEHOLDER = re.compile(r'^(.*?)\x00(\d+)\x00', re.MULTILINE)
+_RE_NON_QUOTE_MARK = re.compile(r'[^>\s]')
+
+# ファイル名に使えない文字をアンダースコアに置き換える変換テーブル
+_FN_TRANS = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
 
 
 class XMLParser:
@@ -19,7 +55,8 @@ class XMLParser:
     def parse(self) -> ET.Element:
         """XMLファイルを読み込み、エレメントツリーを作成"""
         try:
-            self.tree = ET.parse(self.xml_path)
+            xml_parser = ET.XMLParser(huge_tree=True, remove_blank_text=False, recover=True)
+            self.tree = ET.parse(self.xml_path, xml_parser)
             self.root = self.tree.getroot()
             return self.root
         except ET.ParseError as e:
@@ -29,27 +66,38 @@ class XMLParser:
             print(f"ファイルが見つかりません: {self.xml_path}")
             raise
     
-    def get_structure(self, element: Optional[ET.Element] = None, level: int = 0) -> Dict:
-        """XML構造を再帰的に辿り、階層構造を取得"""
-        if element is None:
-            element = self.root
-            
-        result = {
+    def _structure_node(self, element: ET.Element) -> Dict:
+        """構造表示用の1要素分の辞書を作成"""
+        return {
             'tag': element.tag,
             'attributes': element.attrib,
             'text': element.text.strip() if element.text else '',
             'children': []
         }
+    
+    def get_structure(self, element: Optional[ET.Element] = None, level: int = 0) -> Dict:
+        """XML構造を明示的なスタックで辿り、階層構造を取得"""
+        if element is None:
+            element = self.root
+        
+        result = self._structure_node(element)
+        stack = [(element, result)]
+        while stack:
+            current, node = stack.pop()
+            for child in current:
+                child_node = self._structure_node(child)
+                node['children'].append(child_node)
+                stack.append((child, child_node))
         
-        for child in element:
-            result['children'].append(self.get_structure(child, level + 1))
-            
         return result
     
     def print_structure(self, element: Optional[ET.Element] = None, level: int = 0):
         """XML構造を再帰的に表示"""
         if element is None:
             element = self.root
+        if not isinstance(element.tag, str):
+            # コメントや処理命令は表示しない
+            return
             
         indent = "  " * level
         tag_name = self._cleanup_tag_name(element.tag)
@@ -61,48 +109,109 @@ class XMLParser:
         for child in element:
             self.print_structure(child, level + 1)
     
-    def _cleanup_tag_name(self, tag: str) -> str:
+    @staticmethod
+    def _cleanup_tag_name(tag: str) -> str:
         """名前空間を除去したタグ名を取得"""
-        if '}' in tag:
-            return tag.split('}')[-1]
-        return tag
-    
-    def _find_element_by_tag_variants(self, element: ET.Element, tag_variants: List[str]) -> Optional[ET.Element]:
-        """複数のタグバリエーションで要素を探す"""
-        for variant in tag_variants:
-            # 完全一致
-            exact_match = element.find(variant)
-            if exact_match is not None:
-                return exact_match
-            
-            # WordPress.orgのプレフィックス付きのタグ
-            wp_tag = ".//{{{*}}}:" + variant
-            wp_match = element.find(wp_tag)
-            if wp_match is not None:
-                return wp_match
-            
-            # 任意の名前空間を持つタグ
-            ns_tag = ".//{{{*}}}" + variant
-            ns_match = element.find(ns_tag)
-            if ns_match is not None:
-                return ns_match
-        
-        return None
-    
-    def _find_text_by_tag_variants(self, element: ET.Element, tag_variants: List[str]) -> str:
-        """複数のタグバリエーションで要素のテキストを探す"""
-        found_element = self._find_element_by_tag_variants(element, tag_variants)
-        if found_element is not None and found_element.text:
-            return found_element.text.strip()
-        return ""
+        return tag.rpartition('}')[2] or tag
     
     def find_articles(self, article_tag: str = 'item') -> List[ET.Element]:
         """特定のタグ（デフォルトは'item'）を持つ要素を探す"""
         if self.root is None:
             self.parse()
         
+        # RSS/WXRの標準的な位置（channel直下）を先に探す
+        articles = self.root.findall(f"./channel/{article_tag}")
+        if articles:
+            return articles
+        
         return self.root.findall(f".//{article_tag}")
     
+    def _iterparse(self, events: tuple):
+        """XMLファイルを逐次的にパースするイテレータを作成"""
+        return ET.iterparse(self.xml_path, events=events, huge_tree=True, recover=True)
+    
+    @staticmethod
+    def _release(elem: ET.Element):
+        """読み終えた要素と、それ以前の兄弟要素をメモリから解放"""
+        elem.clear()
+        # ルート要素の前にあるコメントなどは親を持たないため、兄弟の削除は行わない
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+    
+    def iter_articles(self, article_tag: str = 'item') -> Iterator[ET.Element]:
+        """記事要素を1つずつ返し、処理済みの要素はメモリから解放する"""
+        # {名前空間}タグの形式で指定された場合は完全一致で比較
+        qualified = '}' in article_tag
+        for _, elem in self._iterparse(('end',)):
+            # それ以外は名前空間を除いたタグ名で比較（_cleanup_tag_nameをインライン展開）
+            tag = elem.tag if qualified else elem.tag.rpartition('}')[2]
+            if tag != article_tag:
+                continue
+            
+            yield elem
+            
+            # 処理済みの記事と、それ以前の兄弟要素を解放
+            self._release(elem)
+    
+    def iter_tag_names(self, limit: int = 10_000) -> Iterator[str]:
+        """XMLファイルを逐次読み込み、名前空間を除いたタグ名を重複なく返す（最大limit種類）"""
+        seen = set()
+        for _, elem in self._iterparse(('end',)):
+            tag_name = elem.tag.rpartition('}')[2]
+            if tag_name not in seen:
+                seen.add(tag_name)
+                yield tag_name
+                if len(seen) >= limit:
+                    return
+            
+            # 読み終えた要素を解放
+            self._release(elem)
+    
+    def print_channel_preview(self, article_tag: str = 'item', limit: int = 15):
+        """ファイルの先頭だけを読み、ルートとchannel直下（channelが無ければルート直下）の要素を簡易表示"""
+        qualified = '}' in article_tag
+        depth = 0
+        channel = None
+        root_child_count = 0
+        child_count = 0
+        for event, elem in self._iterparse(('start', 'end')):
+            if event == 'end':
+                depth -= 1
+                if elem is channel:
+                    break
+                # 読み終えた要素を解放
+                self._release(elem)
+                continue
+            
+            tag_name = self._cleanup_tag_name(elem.tag)
+            is_article = (elem.tag if qualified else tag_name) == article_tag
+            if depth == 0:
+                print(f"Root tag: {tag_name}")
+            elif channel is None and tag_name == 'channel':
+                channel = elem
+                channel_depth = depth
+                print("  Channel found")
+            elif channel is None and depth == 1:
+                # channelが見つかるまではルート直下の要素を表示
+                print(f"  {tag_name}")
+                if is_article:
+                    print(f"    (この要素が記事要素です)")
+                if root_child_count >= limit:  # 最初の要素だけ表示
+                    print("  ...")
+                    break
+                root_child_count += 1
+            elif channel is not None and depth == channel_depth + 1:
+                print(f"    {tag_name}")
+                if is_article:
+                    print(f"      (この要素が記事要素です)")
+                if child_count >= limit:  # 最初の要素だけ表示
+                    print("    ...")
+                    break
+                child_count += 1
+            depth += 1
+    
     def extract_article_content(self, article_element: ET.Element) -> Dict:
         """記事要素からコンテンツを抽出"""
         content = {
@@ -130,21 +239,28 @@ class XMLParser:
             'other_metadata': {}
         }
         
-        # WordPress名前空間の要素を探す
+        # 子要素を1回だけ走査し、WordPress名前空間の要素とそれ以外に分ける
         wp_elements = {}
+        children = {}
         for elem in article_element:
-            tag_name = self._cleanup_tag_name(elem.tag)
+            if not isinstance(elem.tag, str):
+                # コメントなどは対象外
+                continue
+            tag_name = elem.tag.rpartition('}')[2]
+            text = elem.text.strip() if elem.text else ''
             if 'wordpress.org' in elem.tag or '{}' in elem.tag:
-                wp_elements[tag_name] = elem.text.strip() if elem.text else ''
+                wp_elements[tag_name] = text
+            else:
+                children.setdefault(tag_name, text)
         
         # タイトル
-        content['title'] = self._find_text_by_tag_variants(article_element, ['title'])
+        content['title'] = children.get('title', '')
         
         # リンク
-        content['link'] = self._find_text_by_tag_variants(article_element, ['link'])
+        content['link'] = children.get('link', '')
         
         # GUID
-        content['guid'] = self._find_text_by_tag_variants(article_element, ['guid'])
+        content['guid'] = children.get('guid', '')
         
         # 作成者（名前空間付き要素）
         creator_elem = article_element.find('.//{http://purl.org/dc/elements/1.1/}creator')
@@ -166,6 +282,26 @@ class XMLParser:
         return content
 
 
+def _safe_value(value) -> str:
+    """FrontMatter用に値をフォーマット"""
+    if value is None:
+        return "None"
+    if value == "":
+        return '""'
+    # 特殊文字を含まない値はそのまま返す
+    value_str = str(value)
+    if _RE_NEEDS_QUOTE.search(value_str) is None:
+        return value_str
+    # エスケープ処理（バックスラッシュを先にエスケープする）
+    value_str = value_str.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{value_str}"'
+
+
+def _write_markdown(filepath: str, markdown_content: str):
+    """Markdownをファイルに書き込み（1回の書き込みでまとめて出力）"""
+    Path(filepath).write_bytes(markdown_content.encode('utf-8'))
+
+
 class MarkdownExporter:
     """抽出した記事をMarkdown形式でエクスポート"""
     
@@ -175,6 +311,12 @@ class MarkdownExporter:
     
     def export_article(self, article_content: Dict, index: int = 0) -> str:
         """単一の記事をMarkdownファイルに保存"""
+        filepath, markdown_content = self.render_article(article_content, index)
+        _write_markdown(filepath, markdown_content)
+        return filepath
+    
+    def render_article(self, article_content: Dict, index: int = 0) -> tuple:
+        """単一の記事を、保存先のパスとMarkdownの内容に変換（書き込みは行わない）"""
         # ファイル名を生成（タイトルベースまたはインデックスベース）
         if article_content['title']:
             filename = f"{self._sanitize_filename(article_content['title'])}.md"
@@ -190,108 +332,202 @@ class MarkdownExporter:
         # Markdownコンテンツを生成
         markdown_content = self._format_as_markdown(article_content)
         
-        # ファイルに書き込み
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
-        
-        return str(filepath)
+        return str(filepath), markdown_content
     
     def html_to_markdown(self, html_content: str) -> str:
         """HTMLをMarkdownに変換"""
         if not html_content:
             return ""
             
-        # Beautiful Soupを使用してHTMLをパース
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # 各要素を適切なMarkdownに変換
-        self._process_element(soup)
-        
-        # テキストを取得して整形
-        markdown = soup.get_text('\n', strip=False)
+        # 途中の</body>や</html>より後ろが捨てられないよう、閉じタグを取り除く
+        html_content = _RE_DOCUMENT_CLOSE.sub('', html_content)
+        
+        # HTML断片をbodyで包み、UTF-8のバイト列のままlibxml2でパース
+        document = ET.fromstring(b'<html><body>' + html_content.encode('utf-8') + b'</body></html>',
+                                 _HTML_PARSER)
+        # 深さの上限などでパースが打ち切られた場合は、本文の欠落をログに残す
+        for error in _HTML_PARSER.error_log.filter_from_level(ET.ErrorLevels.FATAL):
+            logger.warning("記事本文のHTMLを最後まで読み込めませんでした: %s", error.message)
+        
+        body = document.find('body')
+        return self.html_to_markdown_from_tree(body if body is not None else document)
+    
+    def html_to_markdown_from_tree(self, tree) -> str:
+        """パース済みのlxml要素をMarkdownに変換（要素自身のタグは出力しない）"""
+        code_blocks: List[str] = []
+        markdown = self._render_fragment(tree, code_blocks)
         
         # 複数の空行を2行以下に制限
-        markdown = re.sub(r'\n\s*\n\s*\n+', '\n\n', markdown)
+        markdown = _RE_BLANKLINES.sub('\n\n', markdown)
         
         # 行末の空白を削除
-        markdown = re.sub(r' +$', '', markdown, flags=re.MULTILINE)
+        markdown = _RE_TRAILING_WS.sub('', markdown)
+        
+        # コードブロックを元に戻す
+        markdown = self._restore_code_blocks(markdown, code_blocks)
         
         return markdown.strip()
     
-    def _process_element(self, element):
-        """HTML要素を再帰的に処理してMarkdownに変換"""
-        if element.name == 'h1':
-            element.string = f"# {element.string}\n\n"
-        elif element.name == 'h2':
-            element.string = f"## {element.string}\n\n"
-        elif element.name == 'h3':
-            element.string = f"### {element.string}\n\n"
-        elif element.name == 'h4':
-            element.string = f"#### {element.string}\n\n"
-        elif element.name == 'h5':
-            element.string = f"##### {element.string}\n\n"
-        elif element.name == 'h6':
-            element.string = f"###### {element.string}\n\n"
-        elif element.name == 'p':
-            # 段落は改行とそのあとの空行で区切る
-            if element.string:
-                element.string = f"{element.string}\n\n"
+    def _render_fragment(self, element, code_blocks: List[str]) -> str:
+        """要素の中身をMarkdown文字列に変換"""
+        out: List[str] = []
+        self._emit_markdown(element, out, code_blocks)
+        return ''.join(out)
+    
+    def _restore_code_blocks(self, markdown: str, code_blocks: List[str]) -> str:
+        """プレースホルダーをコードブロックに戻す（リストや引用の中では字下げを揃える）"""
+        def replace(match):
+            prefix = match.group(1)
+            # 2行目以降はリストの記号を空白に置き換えて字下げする（引用の>は残す）
+            continuation = _RE_NON_QUOTE_MARK.sub(' ', prefix)
+            lines = code_blocks[int(match.group(2))].split("\n")
+            rest = [continuation + line if line else continuation.rstrip() for line in lines[1:]]
+            return "\n".join([prefix + lines[0]] + rest)
+        
+        return _RE_CODE_PLACEHOLDER.sub(replace, markdown)
+    
+    def _format_table(self, table) -> str:
+        """テーブルをMarkdownの表に変換（1行目を見出し行とする）"""
+        # 入れ子のテーブルの行は含めず、このテーブル自身の行だけを対象にする
+        own_rows = []
+        for child in table:
+            if child.tag == 'tr':
+                own_rows.append(child)
+            elif child.tag in ('thead', 'tbody', 'tfoot'):
+                own_rows.extend(child.iterchildren('tr'))
+        
+        rows = []
+        for tr in own_rows:
+            cells = [cell.text_content().strip().replace('\n', ' ').replace('|', '\\|')
+                     for cell in tr.iterchildren('th', 'td')]
+            if cells:
+                rows.append(cells)
+        if not rows:
+            return ""
+        
+        width = max(len(cells) for cells in rows)
+        lines = []
+        for row_idx, cells in enumerate(rows):
+            cells = cells + [''] * (width - len(cells))
+            lines.append(f"| {' | '.join(cells)} |")
+            if row_idx == 0:
+                lines.append(f"|{'|'.join([' --- '] * width)}|")
+        return "\n".join(lines) + "\n\n"
+    
+    def _push_children(self, element, stack: deque):
+        """要素のテキストと子要素を、出力順に取り出せるようスタックに積む"""
+        for child in reversed(element):
+            if child.tail:
+                stack.append(child.tail)
+            stack.append(child)
+        if element.text:
+            stack.append(element.text)
+    
+    def _start_block(self, out: List[str]):
+        """ブロック要素の前に、直前の出力が改行で終わるようにする"""
+        if out and not out[-1].endswith("\n"):
+            out.append("\n")
+    
+    def _emit_markdown(self, root, out: List[str], code_blocks: List[str]):
+        """HTML要素を明示的なスタックで走査してMarkdownに変換"""
+        # スタックには出力する文字列か、未処理の要素を積む
+        stack = deque()
+        self._push_children(root, stack)
+        
+        while stack:
+            element = stack.pop()
+            if isinstance(element, str):
+                out.append(element)
+                continue
+            
+            tag = element.tag
+            if not isinstance(tag, str):
+                # コメントや処理命令は出力しない
+                continue
+            
+            if tag in SKIP_TAGS:
+                # 中身は出力しない（後続のテキストはtailとして別に積まれている）
+                continue
+            elif tag in HEADING_LEVELS:
+                self._start_block(out)
+                out.append(f"{'#' * HEADING_LEVELS[tag]} {element.text_content().strip()}\n\n")
+            elif tag == 'p':
+                # 段落は改行とそのあとの空行で区切る
+                self._start_block(out)
+                stack.append("\n\n")
+                self._push_children(element, stack)
+            elif tag == 'a':
+                href = element.get('href', '')
+                text = element.text_content().strip() or href
+                out.append(f"[{text}]({href})")
+            elif tag == 'img':
+                src = element.get('src', '')
+                alt = element.get('alt', '')
+                out.append(f"![{alt}]({src})")
+            elif tag == 'figure':
+                # figureはキャプション付きの画像として扱う
+                img = element.find('.//img')
+                if img is not None:
+                    figcaption = element.find('.//figcaption')
+                    caption = figcaption.text_content().strip() if figcaption is not None else ''
+                    self._start_block(out)
+                    out.append(f"![{caption}]({img.get('src', '')})\n\n")
+                else:
+                    self._push_children(element, stack)
+            elif tag == 'figcaption':
+                # figcaptionは単独で処理しない（figureで処理）
+                pass
+            elif tag == 'ul' or tag == 'ol':
+                # リストの処理（順序付きリストは番号を振り、入れ子のリストは字下げする）
+                self._start_block(out)
+                for idx, li in enumerate(element.iterchildren('li'), 1):
+                    marker = f"{idx}." if tag == 'ol' else "-"
+                    indent = " " * (len(marker) + 1)
+                    lines = self._render_fragment(li, code_blocks).strip().split("\n")
+                    out.append(f"{marker} {lines[0]}\n")
+                    out.extend(f"{indent}{line}\n" if line.strip() else "\n" for line in lines[1:])
+                out.append("\n")
+            elif tag == 'pre':
+                # 整形済みテキストはコードブロックにする（空行や行末の空白は保持）
+                code = element.text_content().strip("\n")
+                code_blocks.append(f"```\n{code}\n```")
+                self._start_block(out)
+                out.append(f"\x00{len(code_blocks) - 1}\x00\n\n")
+            elif tag == 'code':
+                # バッククォートを含む場合は、それより長いバッククォートで囲む
+                code = element.text_content()
+                fence = "`" * (max(map(len, _RE_BACKTICKS.findall(code)), default=0) + 1)
+                pad = " " if code.startswith("`") or code.endswith("`") else ""
+                out.append(f"{fence}{pad}{code}{pad}{fence}")
+            elif tag == 'blockquote':
+                lines = self._render_fragment(element, code_blocks).strip().split("\n")
+                self._start_block(out)
+                out.append("\n".join(f"> {line}".rstrip() for line in lines) + "\n\n")
+            elif tag == 'table':
+                self._start_block(out)
+                out.append(self._format_table(element))
+            elif tag in EMPHASIS_MARKS:
+                # 前後の空白は記号の外側に出す（"** text **"は強調にならない）
+                mark = EMPHASIS_MARKS[tag]
+                inner = self._render_fragment(element, code_blocks)
+                text = inner.strip()
+                if text:
+                    leading = inner[:len(inner) - len(inner.lstrip())]
+                    trailing = inner[len(inner.rstrip()):]
+                    out.append(f"{leading}{mark}{text}{mark}{trailing}")
+                else:
+                    out.append(inner)
+            elif tag == 'br':
+                out.append("\n")
             else:
-                # 子要素を含む場合も適切に処理
-                text = []
-                for child in element.children:
-                    if isinstance(child, str):
-                        text.append(child.strip())
-                    else:
-                        # 再帰的に処理
-                        self._process_element(child)
-                        text.append(child.get_text())
-                element.string = " ".join(text) + "\n\n"
-        elif element.name == 'a':
-            href = element.get('href', '')
-            text = element.string or href
-            element.string = f"[{text}]({href})"
-        elif element.name == 'img':
-            src = element.get('src', '')
-            alt = element.get('alt', '')
-            element.string = f"![]({src})"
-        elif element.name == 'figure':
-            # figureは画像として扱う
-            img = element.find('img')
-            if img:
-                src = img.get('src', '')
-                alt = img.get('alt', '')
-                figcaption = element.find('figcaption')
-                caption = figcaption.string if figcaption else ''
-                element.string = f"![{caption}]({src})\n\n"
-        elif element.name == 'figcaption':
-            # figcaptionは単独で処理しない（figureで処理）
-            element.string = ""
-        elif element.name == 'ul':
-            # リストの処理
-            items = []
-            for li in element.find_all('li', recursive=False):
-                li_text = li.get_text().strip()
-                items.append(f"- {li_text}")
-            element.string = "\n".join(items) + "\n\n"
-        elif element.name == 'ol':
-            # 順序付きリストの処理
-            items = []
-            for idx, li in enumerate(element.find_all('li', recursive=False), 1):
-                li_text = li.get_text().strip()
-                items.append(f"{idx}. {li_text}")
-            element.string = "\n".join(items) + "\n\n"
-        elif element.name == 'br':
-            element.string = "\n"
-        
-        # name属性やid属性を削除（Beautiful Soupが自動的に処理）
-        # 子要素も再帰的に処理
-        for child in element.find_all(recursive=True):
-            self._process_element(child)
+                # その他の要素は中身のテキストだけを出力
+                if tag in BLOCK_TAGS:
+                    self._start_block(out)
+                    stack.append("\n\n")
+                self._push_children(element, stack)
     
     def _sanitize_filename(self, filename: str) -> str:
         """ファイル名として使用できない文字を置換"""
-        import re
         import unicodedata
         
         # 特殊文字を適切に処理
@@ -307,136 +543,123 @@ class MarkdownExporter:
         filename = unicodedata.normalize('NFKC', filename)
         
         # 不適切な文字を置換
-        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-        filename = re.sub(r'\s+', '_', filename)  # 連続する空白をアンダースコアに
+        filename = filename.translate(_FN_TRANS)
+        filename = _RE_SPACES.sub('_', filename)  # 連続する空白をアンダースコアに
         
         # ファイル名の長さを制限（最大100文字）
         return filename[:100]
     
     def _format_as_markdown(self, article_content: Dict) -> str:
         """記事内容をMarkdown形式に整形"""
-        lines = []
-        
-        # FrontMatterの生成
-        lines.append("---")
-        
-        # メタデータのフォーマット
-        def safe_value(value):
-            if value is None:
-                return "None"
-            if value == "":
-                return '""'
-            # エスケープ処理
-            value_str = str(value)
-            if ':' in value_str or '\n' in value_str or '"' in value_str:
-                value_str.replace('"', '\\"')
-                return f'"{value_str}"'
-            return value_str
-        
-        # 基本的なフィールド
-        lines.append(f"title: {safe_value(article_content['title'])}")
-        lines.append(f"post_id: {safe_value(article_content['post_id'])}")
-        lines.append(f"link: {safe_value(article_content['link'])}")
-        lines.append(f"guid: {safe_value(article_content['guid'])}")
-        lines.append(f"description: {safe_value(article_content['description'])}")
-        lines.append(f"pubDate: {safe_value(article_content['pubDate'])}")
-        lines.append(f"post_date: {safe_value(article_content['post_date'])}")
-        lines.append(f"post_date_gmt: {safe_value(article_content['post_date_gmt'])}")
-        lines.append(f"post_modified: {safe_value(article_content['post_modified'])}")
-        lines.append(f"post_modified_gmt: {safe_value(article_content['post_modified_gmt'])}")
-        lines.append(f"comment_status: {safe_value(article_content['comment_status'])}")
-        lines.append(f"ping_status: {safe_value(article_content['ping_status'])}")
-        lines.append(f"post_name: {safe_value(article_content['post_name'])}")
-        lines.append(f"status: {safe_value(article_content['status'])}")
-        lines.append(f"post_parent: {safe_value(article_content['post_parent'])}")
-        lines.append(f"menu_order: {safe_value(article_content['menu_order'])}")
-        lines.append(f"post_type: {safe_value(article_content['post_type'])}")
-        lines.append(f"post_password: {safe_value(article_content['post_password'])}")
-        lines.append(f"is_sticky: {safe_value(article_content['is_sticky'])}")
+        c = article_content
         
         # 追加のメタデータ
-        for key, value in article_content.get('other_metadata', {}).items():
-            lines.append(f"{key}: {safe_value(value)}")
-        
-        lines.append("---")
-        lines.append("")
+        other_metadata = "".join(
+            f"{key}: {_safe_value(value)}\n" for key, value in c.get('other_metadata', {}).items()
+        )
         
         # コンテンツ
-        if article_content['content']:
-            lines.append(article_content['content'])
-        else:
-            lines.append("(No content)")
-        
-        return "\n".join(lines)
+        content_body = c['content'] or "(No content)"
+        
+        # FrontMatterと本文を1つの文字列として生成
+        return (
+            "---\n"
+            f"title: {_safe_value(c['title'])}\n"
+            f"post_id: {_safe_value(c['post_id'])}\n"
+            f"link: {_safe_value(c['link'])}\n"
+            f"guid: {_safe_value(c['guid'])}\n"
+            f"description: {_safe_value(c['description'])}\n"
+            f"pubDate: {_safe_value(c['pubDate'])}\n"
+            f"post_date: {_safe_value(c['post_date'])}\n"
+            f"post_date_gmt: {_safe_value(c['post_date_gmt'])}\n"
+            f"post_modified: {_safe_value(c['post_modified'])}\n"
+            f"post_modified_gmt: {_safe_value(c['post_modified_gmt'])}\n"
+            f"comment_status: {_safe_value(c['comment_status'])}\n"
+            f"ping_status: {_safe_value(c['ping_status'])}\n"
+            f"post_name: {_safe_value(c['post_name'])}\n"
+            f"status: {_safe_value(c['status'])}\n"
+            f"post_parent: {_safe_value(c['post_parent'])}\n"
+            f"menu_order: {_safe_value(c['menu_order'])}\n"
+            f"post_type: {_safe_value(c['post_type'])}\n"
+            f"post_password: {_safe_value(c['post_password'])}\n"
+            f"is_sticky: {_safe_value(c['is_sticky'])}\n"
+            f"{other_metadata}"
+            "---\n"
+            "\n"
+            f"{content_body}"
+        )
+
+
+# プロセスごとに使い回すエクスポーター（出力ディレクトリ別）
+_exporters: Dict[str, MarkdownExporter] = {}
+
+
+def _get_exporter(output_dir: str) -> MarkdownExporter:
+    """出力ディレクトリに対応するエクスポーターを取得"""
+    exporter = _exporters.get(output_dir)
+    if exporter is None:
+        exporter = _exporters[output_dir] = MarkdownExporter(output_dir)
+    return exporter
+
+
+def _export_one(args: tuple) -> tuple:
+    """1記事をMarkdownに変換（ワーカープロセスから呼び出す。書き込みは親プロセスで行う）"""
+    content, index, output_dir = args
+    filepath, markdown_content = _get_exporter(output_dir).render_article(content, index)
+    # プレビューに必要な項目だけを返す
+    preview = {key: content[key] for key in ('title', 'link', 'post_date')}
+    return index, preview, filepath, markdown_content
+
+
+def _save_export(index: int, content: Dict, filepath: str, markdown_content: str) -> str:
+    """変換結果を書き込み、簡易プレビューをログに出力（--verbose指定時のみ表示）"""
+    _write_markdown(filepath, markdown_content)
+    logger.info("記事#%d を保存しました: %s (タイトル: %s, リンク: %s, 投稿日: %s)",
+                index + 1, filepath, content['title'], content['link'], content['post_date'])
+    return filepath
 
 
 # メイン処理
-def process_xml_to_markdown(xml_path: str, output_dir: str = "assets", article_tag: str = "item"):
+def process_xml_to_markdown(xml_path: str, output_dir: str = "assets", article_tag: str = "item",
+                            jobs: Optional[int] = None):
     """XMLファイルを読み込み、記事をMarkdownに変換"""
     
     print(f"XMLファイルを読み込んでいます: {xml_path}")
     
-    # XMLパーサーとエクスポーターを初期化
+    # XMLパーサーを初期化し、出力ディレクトリを先に作成
     parser = XMLParser(xml_path)
-    exporter = MarkdownExporter(output_dir)
+    _get_exporter(output_dir)
     
     try:
-        # XMLファイルをパース
-        parser.parse()
-        
         # XML構造を表示（簡易版）
         print("\nXML構造（簡易表示）:")
-        root = parser.root
-        print(f"Root tag: {parser._cleanup_tag_name(root.tag)}")
-        
-        # channelとitemのサンプル構造を表示
-        channel = root.find('.//channel')
-        if channel is not None:
-            print(f"  Channel found")
-            print(f"  Channel内の要素数: {len(list(channel))}")
-            for i, child in enumerate(channel):
-                tag_name = parser._cleanup_tag_name(child.tag)
-                print(f"    {tag_name}")
-                if tag_name == article_tag:
-                    print(f"      (この要素が記事要素です)")
-                if i >= 15:  # 最初の15要素だけ表示
-                    print("    ...")
-                    break
+        parser.print_channel_preview(article_tag)
         
-        # 記事要素を探す
-        articles = parser.find_articles(article_tag)
-        print(f"\n{len(articles)}個の記事が見つかりました。")
+        # 記事要素を逐次読み込みながら、変換はプロセスを分けて並列に実行
+        # 書き込みは元の順序どおり親プロセスで行い、同名の記事は常に後の記事で上書きする
+        tasks = ((parser.extract_article_content(article), i, output_dir)
+                 for i, article in enumerate(parser.iter_articles(article_tag)))
+        exported_files = []
+        if jobs == 1:
+            for result in map(_export_one, tasks):
+                exported_files.append(_save_export(*result))
+        else:
+            with multiprocessing.Pool(jobs) as pool:
+                for result in pool.imap(_export_one, tasks, chunksize=16):
+                    exported_files.append(_save_export(*result))
         
-        if len(articles) == 0:
+        if len(exported_files) == 0:
             print("\n警告：記事が見つかりません。以下をチェックしてください：")
             print("1. article_tagが正しいか確認してください（デフォルト：'item'）")
             print("2. XMLファイルの構造を確認してください")
             
-            # 全要素の種類を表示
+            # 全要素の種類を、見つかった順に逐次表示
             print("\nXMLファイル内のすべてのタグ：")
-            all_tags = set()
-            for elem in root.iter():
-                tag_name = parser._cleanup_tag_name(elem.tag)
-                all_tags.add(tag_name)
-            for tag in sorted(all_tags):
-                print(f"  - {tag}")
+            for tag in parser.iter_tag_names():
+                print(f"  - {tag}", flush=True)
             
             return []
         
-        # 各記事を処理
-        exported_files = []
-        for i, article in enumerate(articles):
-            content = parser.extract_article_content(article)
-            filepath = exporter.export_article(content, i)
-            exported_files.append(filepath)
-            print(f"\n記事#{i+1}を保存しました: {filepath}")
-            
-            # 簡易プレビュー
-            if content['title']:
-                print(f"  タイトル: {content['title']}")
-            print(f"  リンク: {content['link']}")
-            print(f"  投稿日: {content['post_date']}")
-        
         print(f"\n処理完了！ 合計{len(exported_files)}個のMarkdownファイルを作成しました。")
         print(f"出力ディレクトリ: {output_dir}")
         
@@ -453,11 +676,24 @@ def process_xml_to_markdown(xml_path: str, output_dir: str = "assets", article_t
 def parse_arguments():
     """コマンドライン引数をパース"""
     import argparse
+    
+    def positive_int(value: str) -> int:
+        """1以上の整数かどうかを検証"""
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"整数を指定してください: {value}")
+        if number < 1:
+            raise argparse.ArgumentTypeError(f"1以上の整数を指定してください: {value}")
+        return number
+    
     parser = argparse.ArgumentParser(description="XMLファイルを読み込み、記事をMarkdownに変換します。")
     
     parser.add_argument("xml_path", help="入力XMLファイルのパス")
     parser.add_argument("-o", "--output", default="assets", help="出力ディレクトリの場所（デフォルト: assets）")
     parser.add_argument("-t", "--tag", default="item", help="記事要素のタグ名（デフォルト: item）")
+    parser.add_argument("-v", "--verbose", action="store_true", help="記事ごとの保存結果を表示")
+    parser.add_argument("-j", "--jobs", type=positive_int, default=None, help="並列実行するプロセス数（デフォルト: CPU数）")
     
     return parser.parse_args()
 
@@ -466,6 +702,7 @@ def parse_arguments():
 if __name__ == "__main__":
     # コマンドライン引数を解析
     args = parse_arguments()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
     
     print(f"入力XMLファイル: {args.xml_path}")
     print(f"出力ディレクトリ: {args.output}")
@@ -477,7 +714,8 @@ if __name__ == "__main__":
         process_xml_to_markdown(
             xml_path=args.xml_path,
             output_dir=args.output,
-            article_tag=args.tag
+            article_tag=args.tag,
+            jobs=args.jobs
         )
     except Exception as e:
         print(f"処理に失敗しました: {e}")
@@ -0,0 +1,176 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from note2markdown import MarkdownExporter, XMLParser, _safe_value, process_xml_to_markdown
+
+ATOM_WITH_LEADING_COMMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<?xml-stylesheet href="feed.xsl"?>
+<!-- generator="test" -->
+<feed xmlns="http://www.w3.org/2005/Atom"><title>feed</title><entry><title>E1</title></entry></feed>
+"""
+
+
+class HtmlToMarkdownTest(unittest.TestCase):
+    """HTML→Markdown変換の入出力を確認"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.exporter = MarkdownExporter(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def assertConverts(self, html_content, expected):
+        self.assertEqual(self.exporter.html_to_markdown(html_content), expected)
+
+    def test_basic_elements(self):
+        self.assertConverts(
+            '<h2>見出し</h2><p>本文 <a href="https://example.com">リンク</a></p>'
+            '<figure><img src="a.png"><figcaption>キャプション</figcaption></figure>',
+            '## 見出し\n\n本文 [リンク](https://example.com)\n\n![キャプション](a.png)',
+        )
+
+    def test_lists(self):
+        self.assertConverts(
+            '<ul><li>a<ul><li>b</li></ul></li><li>c</li></ul><ol><li>x</li><li>y</li></ol>',
+            '- a\n  - b\n- c\n\n1. x\n2. y',
+        )
+
+    def test_blocks_start_on_new_line(self):
+        self.assertConverts('intro<h2>Head</h2>', 'intro\n## Head')
+        self.assertConverts('<img src="a.png"><h2>H</h2>', '![](a.png)\n## H')
+        self.assertConverts('text<p>after</p>', 'text\nafter')
+        self.assertConverts('<span>x</span><pre>code</pre>', 'x\n```\ncode\n```')
+
+    def test_code_block_is_preserved(self):
+        self.assertConverts(
+            '<pre>def a():  \n    pass\n\n\ndef b():\n    pass</pre>',
+            '```\ndef a():  \n    pass\n\n\ndef b():\n    pass\n```',
+        )
+
+    def test_blockquote_and_table(self):
+        self.assertConverts('<blockquote><p>q1</p><p>q2</p></blockquote>', '> q1\n>\n> q2')
+        self.assertConverts(
+            '<table><tr><th>h1</th><th>h2</th></tr><tr><td>a|b</td></tr></table>',
+            '| h1 | h2 |\n| --- | --- |\n| a\\|b |  |',
+        )
+
+    def test_nested_table_rows_are_not_repeated(self):
+        self.assertConverts(
+            '<table><tr><td><table><tr><td>in</td></tr></table></td></tr></table>',
+            '| in |\n| --- |',
+        )
+        self.assertConverts(
+            '<table><thead><tr><th>h</th></tr></thead><tbody><tr><td>b</td></tr></tbody></table>',
+            '| h |\n| --- |\n| b |',
+        )
+
+    def test_inline_code_with_backticks(self):
+        self.assertConverts('<code>x`y</code>', '``x`y``')
+        self.assertConverts('<code>`a`</code>', '`` `a` ``')
+
+    def test_emphasis_whitespace_outside_marks(self):
+        self.assertConverts('a<strong> spaced </strong>b', 'a **spaced** b')
+        self.assertConverts('<p><em>x</em> and <b>y</b></p>', '*x* and **y**')
+
+    def test_content_after_stray_document_close_is_kept(self):
+        self.assertConverts('<p>a</p></body></html><p>after</p>', 'a\n\nafter')
+
+
+    def test_script_and_style_are_skipped(self):
+        self.assertConverts('<script>var a=1;</script><style>.x{}</style><p>t</p>', 't')
+        self.assertConverts('a<script>x()</script>b', 'ab')
+
+    def test_deeply_nested_content_is_kept(self):
+        self.assertConverts(
+            '<p>before</p>' + '<span>' * 300 + 'x' + '</span>' * 300 + '<p>after</p>',
+            'before\n\nx\nafter',
+        )
+
+    def test_truncated_html_is_logged(self):
+        with self.assertLogs('note2markdown', level='WARNING'):
+            self.exporter.html_to_markdown('<div>' * 3000 + 'x' + '</div>' * 3000)
+
+
+class SafeValueTest(unittest.TestCase):
+    """FrontMatterの値のフォーマットを確認"""
+
+    def test_plain_values(self):
+        self.assertEqual(_safe_value(None), 'None')
+        self.assertEqual(_safe_value(''), '""')
+        self.assertEqual(_safe_value(123), '123')
+        self.assertEqual(_safe_value('plain text'), 'plain text')
+
+    def test_quotes_are_escaped(self):
+        self.assertEqual(_safe_value('Hello: "World"'), '"Hello: \\"World\\""')
+
+    def test_backslashes_are_escaped(self):
+        self.assertEqual(_safe_value('C:\\dir'), '"C:\\\\dir"')
+
+    def test_title_in_front_matter(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exporter = MarkdownExporter(tmpdir)
+            content = {key: '' for key in (
+                'title', 'post_id', 'link', 'guid', 'description', 'pubDate', 'post_date',
+                'post_date_gmt', 'post_modified', 'post_modified_gmt', 'comment_status',
+                'ping_status', 'post_name', 'status', 'post_parent', 'menu_order', 'post_type',
+                'post_password', 'is_sticky', 'content')}
+            content['title'] = 'Hello: "World"'
+            markdown = exporter._format_as_markdown(content)
+        self.assertIn('\ntitle: "Hello: \\"World\\""\n', markdown)
+
+
+class ProcessXmlToMarkdownTest(unittest.TestCase):
+    """XMLファイル全体の変換処理を確認"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.tmpdir.name, 'out')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def convert(self, xml_content, article_tag):
+        xml_path = os.path.join(self.tmpdir.name, 'export.xml')
+        with open(xml_path, 'w', encoding='utf-8') as f:
+            f.write(xml_content)
+        self.stdout = io.StringIO()
+        with contextlib.redirect_stdout(self.stdout):
+            return process_xml_to_markdown(xml_path, self.output_dir, article_tag, jobs=1)
+
+    def test_feed_without_channel_and_leading_comment(self):
+        exported = self.convert(ATOM_WITH_LEADING_COMMENT, 'entry')
+        self.assertEqual([os.path.basename(path) for path in exported], ['E1.md'])
+
+    def test_article_tag_is_root_with_leading_comment(self):
+        exported = self.convert('<!-- c --><item><title>Only</title></item>', 'item')
+        self.assertEqual([os.path.basename(path) for path in exported], ['Only.md'])
+
+    def test_namespace_qualified_article_tag(self):
+        exported = self.convert(ATOM_WITH_LEADING_COMMENT, '{http://www.w3.org/2005/Atom}entry')
+        self.assertEqual([os.path.basename(path) for path in exported], ['E1.md'])
+        self.assertIn('(この要素が記事要素です)', self.stdout.getvalue())
+
+    def test_print_structure_skips_comments(self):
+        xml_path = os.path.join(self.tmpdir.name, 'export.xml')
+        with open(xml_path, 'w', encoding='utf-8') as f:
+            f.write('<rss><channel><!-- c --><item><title>T</title></item></channel></rss>')
+        parser = XMLParser(xml_path)
+        parser.parse()
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            parser.print_structure()
+        self.assertIn('    item: {}\n', stdout.getvalue())
+
+    def test_no_articles_lists_tags_with_leading_comment(self):
+        exported = self.convert(ATOM_WITH_LEADING_COMMENT, 'item')
+        self.assertEqual(exported, [])
+        self.assertIn('  - entry\n', self.stdout.getvalue())
+        self.assertIn('  - feed\n', self.stdout.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()